@@ -1,7 +1,22 @@
 from django.contrib import admin
+from django.db import connections
+from django.db.models import CharField, Func, Value
 
 from .models import Request
 
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+POSTGRES_TIMESTAMP_FORMAT = "YYYY-MM-DD HH24:MI:SS.US"
+
+
+def _to_char(field_name):
+    """Format a timestamp column in PostgreSQL like TIMESTAMP_FORMAT."""
+    return Func(
+        field_name,
+        Value(POSTGRES_TIMESTAMP_FORMAT),
+        function="TO_CHAR",
+        output_field=CharField(),
+    )
+
 
 @admin.register(Request)
 class RequestAdmin(admin.ModelAdmin):
@@ -119,25 +134,41 @@ class RequestAdmin(admin.ModelAdmin):
         ),
     )
 
+    def get_queryset(self, request):
+        """Format the timestamps in the query on PostgreSQL so the list view does not
+        call strftime for every row."""
+        queryset = super().get_queryset(request)
+        if connections[queryset.db].vendor != "postgresql":
+            return queryset
+        return queryset.annotate(
+            formatted_start_at=_to_char("start_at"),
+            formatted_end_at=_to_char("end_at"),
+        )
+
     # Custom formatting methods for timestamps with seconds and microseconds
     def format_start_at(self, obj):
         """Format start_at timestamp with seconds and microseconds."""
-        return (
-            obj.start_at.strftime("%Y-%m-%d %H:%M:%S.%f")
-            if obj.start_at
-            else ""
-        )
+        return self._format_timestamp(obj, "start_at")
 
     format_start_at.short_description = "Start Time"
     format_start_at.admin_order_field = "start_at"
 
     def format_end_at(self, obj):
         """Format end_at timestamp with seconds and microseconds."""
-        return obj.end_at.strftime("%Y-%m-%d %H:%M:%S.%f") if obj.end_at else ""
+        return self._format_timestamp(obj, "end_at")
 
     format_end_at.short_description = "End Time"
     format_end_at.admin_order_field = "end_at"
 
+    def _format_timestamp(self, obj, field_name):
+        """Return the timestamp formatted by the query, or format it here when the
+        database did not."""
+        formatted = getattr(obj, f"formatted_{field_name}", None)
+        if formatted is not None:
+            return formatted
+        value = getattr(obj, field_name)
+        return value.strftime(TIMESTAMP_FORMAT) if value else ""
+
     # Ordering in list view
     ordering = ("-created_at",)
 
@@ -0,0 +1,59 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from numenor_monitor.models import Request
+
+
+class Command(BaseCommand):
+    """Delete logged requests older than the retention period.
+
+    Rows are deleted in chunks of primary keys selected through the created_at index, so
+    each DELETE stays short and does not hold locks on the whole table while the logger
+    keeps inserting.
+    """
+
+    help = "Delete logged requests older than the retention period."
+
+    def add_arguments(self, parser):
+        """Add the retention, chunk size and database options."""
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=getattr(settings, "NUMENOR_RETENTION_DAYS", 30),
+            help="Keep requests logged within this many days.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Number of requests deleted per statement.",
+        )
+        parser.add_argument(
+            "--database",
+            default=getattr(settings, "NUMENOR_DATABASE", "default"),
+            help="Database alias the requests are logged to.",
+        )
+
+    def handle(self, *args, **options):
+        """Delete expired requests chunk by chunk and report the total."""
+        for option in ("days", "batch_size"):
+            if options[option] < 1:
+                raise CommandError(
+                    f"--{option.replace('_', '-')} must be a positive integer."
+                )
+        cutoff = timezone.now() - datetime.timedelta(days=options["days"])
+        requests = Request.objects.using(options["database"])
+        expired = requests.filter(created_at__lt=cutoff).order_by("created_at")
+        deleted = 0
+        while True:
+            pks = list(
+                expired.values_list("pk", flat=True)[: options["batch_size"]]
+            )
+            if not pks:
+                break
+            count, _ = requests.filter(pk__in=pks).delete()
+            deleted += count
+        self.stdout.write(f"Deleted {deleted} requests logged before {cutoff}.")
@@ -1,46 +1,181 @@
+import atexit
+import collections
+import contextlib
+import datetime
+import functools
+import itertools
 import logging
-import queue
+import random
+import re
+import signal
+import sys
 import threading
+import time
 
+from django.conf import settings
+from django.db import connections, transaction
 from django.utils import timezone
 
 from .models import Request
 
+MAX_BULK_CREATE_BATCH_SIZE = 65535 // len(Request._meta.concrete_fields)
+POLL_INTERVAL = 0.01
+STOP_TIMEOUT = 5
+MAX_ERROR_SIZE = 2048
+DEFAULT_SKIP_RE = r"^/(static|media)/|^/favicon\.ico$|^/health/?$"
+SCHEMES = {label: value for value, label in Request.Scheme.choices}
+METHODS = {label: value for value, label in Request.Method.choices}
+LOGGED_FIELDS = (
+    "scheme",
+    "host",
+    "path",
+    "query",
+    "method",
+    "remote_addr",
+    "x_forwarded_for",
+    "cf_connecting_ip",
+    "user_agent",
+    "user_id",
+    "username",
+    "start_at",
+    "end_at",
+    "status_code",
+    "error",
+    "request_size",
+    "response_size",
+)
+
 
 class RequestLogger:
-    """Asynchronous logger for Request instances using a queue and background thread.
+    """Asynchronous logger for Request instances using a buffer and background thread.
 
-    This class manages a queue of request data and processes them in a separate thread
+    This class manages a bounded buffer of request data and processes it in a separate thread
     to avoid blocking the main request-response cycle. It batches inserts for better performance
     and flushes periodically based on time to ensure data is not held indefinitely.
 
+    Each buffer is a ``collections.deque`` whose ``append`` and ``popleft`` are atomic, so
+    producers never take a lock or notify the consumer. When a buffer is full the oldest
+    entries are dropped rather than blocking the request-response cycle.
+
+    With several workers, records are dealt round-robin across one buffer per worker, and
+    each worker thread inserts its own buffer through its own database connection, so
+    batches are committed in parallel.
+
+    Like ``logging.handlers.QueueListener``, the background threads are managed with
+    ``start`` and ``stop``; ``stop`` is registered with ``atexit`` so pending records are
+    flushed when the process exits instead of being lost with the daemon threads.
+
     Attributes:
-        queue (queue.Queue): Thread-safe queue for storing request data.
+        buffers (list): Bounded ring buffers storing request data, one per worker.
         batch_size (int): Number of records to accumulate before bulk inserting.
+        bulk_create_batch_size (int): Maximum number of rows per INSERT statement.
         flush_interval (int): Time in seconds to wait before flushing even if batch not full.
-        thread (threading.Thread): Background daemon thread for processing the queue.
+        threads (list): Background daemon threads, one per buffer, while started.
+        using (str): Database alias the records are written to.
     """
 
-    def __init__(self, batch_size=10, use_thread=True, flush_interval=60):
-        """Initialize the RequestLogger with a queue and optionally start the background
-        thread.
+    def __init__(
+        self,
+        batch_size=10,
+        use_thread=True,
+        flush_interval=5,
+        bulk_create_batch_size=None,
+        max_buffer=None,
+        using=None,
+        workers=None,
+    ):
+        """Initialize the RequestLogger with a buffer and optionally start the
+        background thread.
 
         Args:
             batch_size (int): Number of records to batch before inserting into the database.
             use_thread (bool): Whether to use a background thread for processing.
             flush_interval (int): Time in seconds to wait before flushing the batch even if not full.
+            bulk_create_batch_size (int): Maximum number of rows per INSERT statement.
+                Defaults to the NUMENOR_BULK_CREATE_BATCH_SIZE setting and is capped by
+                MAX_BULK_CREATE_BATCH_SIZE to stay under the 65535 bind-parameter limit.
+            max_buffer (int): Maximum number of pending records per worker before the oldest
+                are dropped. Defaults to the NUMENOR_LOG_BUFFER_SIZE setting.
+            using (str): Database alias the records are written to. Defaults to the
+                NUMENOR_DATABASE setting, so logging can go through its own connection
+                settings or database instead of the one serving the application.
+            workers (int): Number of buffers and background threads inserting them.
+                Defaults to the NUMENOR_FLUSH_WORKERS setting.
         """
-        self.queue = queue.Queue()
+        max_buffer = max_buffer or getattr(
+            settings, "NUMENOR_LOG_BUFFER_SIZE", 100000
+        )
+        workers = workers or getattr(settings, "NUMENOR_FLUSH_WORKERS", 1)
+        self.buffers = [
+            collections.deque(maxlen=max_buffer) for _ in range(workers)
+        ]
         self.batch_size = batch_size
+        self.bulk_create_batch_size = min(
+            bulk_create_batch_size
+            or getattr(settings, "NUMENOR_BULK_CREATE_BATCH_SIZE", 500),
+            MAX_BULK_CREATE_BATCH_SIZE,
+        )
         self.flush_interval = flush_interval
-        self.last_flush = timezone.now()
+        self.using = using or getattr(settings, "NUMENOR_DATABASE", "default")
+        self.threads = []
+        self._next_buffer = itertools.count()
+        self._stop_event = threading.Event()
         if use_thread:
-            self.thread = threading.Thread(
-                target=self._process_queue, daemon=True
+            self.start()
+
+    def start(self):
+        """Start a background thread per buffer and flush pending records at exit."""
+        self._stop_event.clear()
+        self.threads = [
+            threading.Thread(
+                target=self._process_queue, args=(buffer,), daemon=True
             )
-            self.thread.start()
-        else:
-            self.thread = None
+            for buffer in self.buffers
+        ]
+        for thread in self.threads:
+            thread.start()
+        atexit.unregister(self.stop)
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Stop the background threads and flush the records still pending.
+
+        Each thread is given STOP_TIMEOUT seconds to flush its current batch; whatever
+        remains in the buffers is then inserted synchronously. The exit hook stays
+        registered so records logged after an early stop, e.g. while a worker finishes
+        in-flight requests after SIGTERM, are flushed too.
+        """
+        self._stop_event.set()
+        for thread in self.threads:
+            thread.join(STOP_TIMEOUT)
+        self.threads = []
+        self.process_batch()
+
+    def install_signal_handlers(self):
+        """Stop the background threads when the process receives SIGTERM.
+
+        The handler only sets the stop event: each worker flushes its current batch
+        as it exits and the atexit hook inserts whatever is left, so no database
+        work runs on the interrupted main thread. The previously installed handler
+        is always chained so servers such as gunicorn or uWSGI keep their own
+        graceful shutdown; with the default disposition the process exits through
+        SystemExit so the atexit hook still runs. Signal handlers can only be
+        installed from the main thread, so this does nothing elsewhere.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        previous = signal.getsignal(signal.SIGTERM)
+
+        def handle_sigterm(signum, frame):
+            try:
+                self._stop_event.set()
+            finally:
+                if callable(previous):
+                    previous(signum, frame)
+                elif previous != signal.SIG_IGN:
+                    sys.exit(128 + signum)
+
+        signal.signal(signal.SIGTERM, handle_sigterm)
 
     def log_request(
         self,
@@ -62,7 +197,15 @@ class RequestLogger:
         request_size,
         response_size,
     ):
-        """Add request data to the queue for asynchronous processing.
+        """Add request data to a buffer for asynchronous processing.
+
+        Buffers are picked round-robin, so the records spread evenly across the
+        workers even when every request arrives from the same proxy address.
+        The data is buffered as a tuple in LOGGED_FIELDS order, which both the
+        COPY and the bulk_create paths consume without per-row field lookups;
+        the tuple below must be kept in step with LOGGED_FIELDS.
+        The scheme and method are converted to their Request.Scheme and
+        Request.Method values; unknown methods are stored as Method.OTHER.
 
         Args:
             scheme (str): URL scheme.
@@ -83,82 +226,167 @@ class RequestLogger:
             request_size (int): Request body size.
             response_size (int): Response body size.
         """
-        self.queue.put(
-            {
-                "scheme": scheme,
-                "host": host,
-                "path": path,
-                "query": query,
-                "method": method,
-                "remote_addr": remote_addr,
-                "x_forwarded_for": x_forwarded_for,
-                "cf_connecting_ip": cf_connecting_ip,
-                "user_agent": user_agent,
-                "user": user,
-                "username": username,
-                "start_at": start_at,
-                "end_at": end_at,
-                "status_code": status_code,
-                "error": error,
-                "request_size": request_size,
-                "response_size": response_size,
-            }
+        self.buffers[next(self._next_buffer) % len(self.buffers)].append(
+            (
+                SCHEMES[scheme],
+                host,
+                path,
+                query,
+                METHODS.get(method, Request.Method.OTHER),
+                remote_addr,
+                x_forwarded_for,
+                cf_connecting_ip,
+                user_agent,
+                None if user is None else user.pk,
+                username,
+                start_at,
+                end_at,
+                status_code,
+                error,
+                request_size,
+                response_size,
+            )
         )
 
     def process_batch(self):
-        """Synchronously process the current batch in the queue.
+        """Synchronously process the pending records in the buffers.
 
         Useful for tests or manual processing.
         """
-        batch = []
-        while not self.queue.empty():
-            item = self.queue.get()
-            batch.append(Request(**item))
-            if len(batch) >= self.batch_size:
-                Request.objects.bulk_create(batch)
+        for buffer in self.buffers:
+            batch = []
+            self._drain_buffer(buffer, batch)
+            while batch:
+                self._bulk_create(batch)
                 batch = []
-        if batch:
-            Request.objects.bulk_create(batch)
+                self._drain_buffer(buffer, batch)
 
-    def _process_queue(self):
-        """Background thread method to process the queue.
+    def _process_queue(self, buffer):
+        """Background thread method to process one buffer.
 
-        Continuously checks the queue, accumulates records up to batch_size, and
-        performs bulk inserts into the database. Also flushes based on time interval.
-        """
-        from django.db import connection
+        Continuously checks the buffer, accumulates records up to batch_size, and
+        performs bulk inserts into the database. Also flushes based on time interval:
+        the deadline is checked on every iteration, whether or not new records
+        arrived, so a partial batch never waits much longer than flush_interval.
+        Django connections are per thread, so each worker inserts through its own
+        connection. Exits once stop() is called, flushing the batch it was
+        accumulating.
 
-        connection.ensure_connection()
+        Args:
+            buffer (collections.deque): The buffer this thread consumes.
+        """
+        connections[self.using].ensure_connection()
         batch = []
-        while True:
-            try:
-                item = self.queue.get(timeout=1)
-                batch.append(Request(**item))
-                if len(batch) >= self.batch_size:
-                    self._flush_batch(batch)
-            except queue.Empty:
-                pass
-            # Check for time-based flush
-            if (
-                batch
-                and (timezone.now() - self.last_flush).total_seconds()
-                > self.flush_interval
-            ):
+        flush_deadline = None
+        while not self._stop_event.is_set():
+            if self._flush_due(batch, flush_deadline):
                 self._flush_batch(batch)
+            if buffer:
+                if not batch:
+                    flush_deadline = time.monotonic() + self.flush_interval
+                self._drain_buffer(buffer, batch)
+            else:
+                self._stop_event.wait(POLL_INTERVAL)
+        if batch:
+            self._flush_batch(batch)
+
+    def _flush_due(self, batch, flush_deadline):
+        """Whether the batch is full or its oldest record has waited until
+        flush_deadline, a time.monotonic() value."""
+        return len(batch) >= self.batch_size or bool(
+            batch and time.monotonic() >= flush_deadline
+        )
+
+    def _drain_buffer(self, buffer, batch):
+        """Move buffered items into the batch until it is full or the buffer is
+        empty."""
+        with contextlib.suppress(IndexError):
+            while len(batch) < self.batch_size:
+                batch.append(buffer.popleft())
 
     def _flush_batch(self, batch):
         """Flush the current batch to the database and reset."""
         try:
-            Request.objects.bulk_create(batch)
+            self._bulk_create(batch)
             batch.clear()
-            self.last_flush = timezone.now()
         except Exception as e:
             logger = logging.getLogger(__name__)
             logger.error("Error bulk creating records: %s", e)
             batch.clear()
 
+    def _bulk_create(self, batch):
+        """Insert the batch of request data into the database.
 
-request_logger = RequestLogger(batch_size=50, flush_interval=5)
+        Each batch is committed in its own transaction on the logger's database. On
+        PostgreSQL with psycopg 3 the rows are streamed with COPY, skipping Request
+        instantiation entirely. Other backends use bulk_create with INSERT statements of
+        bounded size.
+        """
+        with transaction.atomic(using=self.using):
+            if _supports_copy(connections[self.using]):
+                self._copy(batch)
+                return
+            Request.objects.db_manager(self.using).bulk_create(
+                [_new_request(row) for row in batch],
+                batch_size=self.bulk_create_batch_size,
+            )
+
+    def _copy(self, batch):
+        """Stream the batch into the Request table with COPY FROM STDIN."""
+        created_at = timezone.now()
+        with (
+            connections[self.using].cursor() as cursor,
+            cursor.copy(_copy_sql(self.using)) as copy,
+        ):
+            for row in batch:
+                copy.write_row((*row, created_at))
+
+
+def _new_request(row):
+    """Build an unsaved Request from a buffered LOGGED_FIELDS tuple.
+
+    The row is passed by field name and must have exactly one value per LOGGED_FIELDS
+    entry.
+    """
+    return Request(**dict(zip(LOGGED_FIELDS, row, strict=True)))
+
+
+@functools.cache
+def _copy_sql(using):
+    """Build the COPY statement for LOGGED_FIELDS followed by created_at."""
+    quote_name = connections[using].ops.quote_name
+    columns = ", ".join(
+        quote_name(Request._meta.get_field(name).column)
+        for name in (*LOGGED_FIELDS, "created_at")
+    )
+    return f"COPY {quote_name(Request._meta.db_table)} ({columns}) FROM STDIN"
+
+
+def _supports_copy(connection):
+    """Whether the connection can stream rows with psycopg 3 COPY."""
+    if connection.vendor != "postgresql":
+        return False
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+    return is_psycopg3
+
+
+request_logger = RequestLogger(
+    batch_size=getattr(settings, "NUMENOR_LOG_BATCH", 1000),
+    flush_interval=getattr(settings, "NUMENOR_LOG_FLUSH_INTERVAL", 5),
+    use_thread=False,
+)
+
+
+@functools.cache
+def _start_request_logger():
+    """Start the request_logger threads and SIGTERM handler once per process.
+
+    Called when the middleware is loaded, so management commands and other processes
+    that only run django.setup() start no threads.
+    """
+    request_logger.start()
+    request_logger.install_signal_handlers()
 
 
 class RequestLoggingMiddleware:
@@ -175,21 +403,32 @@ class RequestLoggingMiddleware:
     - Response details: status code, sizes, errors
 
     Records are batched and inserted asynchronously to handle high traffic efficiently.
+    Requests whose path matches the NUMENOR_SKIP_RE setting (static files, favicon and
+    health checks by default) are passed through without being logged. Responses with a
+    status below 400 are logged with the probability given by the NUMENOR_SAMPLE_OK setting,
+    while client and server errors are always logged.
     """
 
     def __init__(self, get_response):
-        """Initialize the middleware with the get_response callable.
+        """Initialize the middleware with the get_response callable and start the
+        request logger.
 
         Args:
             get_response (callable): The next middleware or view in the chain.
         """
         self.get_response = get_response
+        _start_request_logger()
+        skip_re = getattr(settings, "NUMENOR_SKIP_RE", DEFAULT_SKIP_RE)
+        self.skip_re = re.compile(skip_re) if skip_re else None
+        self.sample_ok = getattr(settings, "NUMENOR_SAMPLE_OK", 1.0)
 
     def __call__(self, request):
         """Process the incoming request and response.
 
         This method is called for each request. It records the start time, calls the next
-        middleware/view, records the end time, and then saves a Request.
+        middleware/view, records the end time, and then saves a Request. The end time is
+        derived from the monotonic duration so the wall clock is only read once.
+        Successful responses left out by NUMENOR_SAMPLE_OK are returned unlogged.
 
         Args:
             request (HttpRequest): The incoming HTTP request object.
@@ -197,10 +436,21 @@ class RequestLoggingMiddleware:
         Returns:
             HttpResponse: The HTTP response object.
         """
+        if self.skip_re is not None and self.skip_re.match(request.path_info):
+            return self.get_response(request)
         start_at = timezone.now()
+        start = time.monotonic()
         response = self.get_response(request)
+        if (
+            self.sample_ok < 1
+            and response.status_code < 400
+            and random.random() >= self.sample_ok
+        ):
+            return response
         try:
-            end_at = timezone.now()
+            end_at = start_at + datetime.timedelta(
+                seconds=time.monotonic() - start
+            )
             status_code = response.status_code
             request_size, response_size = self._calculate_sizes(
                 request, response
@@ -235,6 +485,10 @@ class RequestLoggingMiddleware:
     def _calculate_sizes(self, request, response):
         """Calculate request and response sizes.
 
+        The request size is taken from CONTENT_LENGTH only; the body is never
+        read, so requests without the header, or with a malformed or negative
+        one, are logged as 0.
+
         Args:
             request (HttpRequest): The HTTP request.
             response (HttpResponse): The HTTP response.
@@ -242,44 +496,63 @@ class RequestLoggingMiddleware:
         Returns:
             tuple: (request_size, response_size)
         """
-        content_length = request.META.get("CONTENT_LENGTH")
-        request_size = (
-            int(content_length) if content_length else len(request.body)
-        )
-        response_size = (
-            len(response.content) if hasattr(response, "content") else 0
-        )
-        return request_size, response_size
+        try:
+            request_size = max(int(request.META.get("CONTENT_LENGTH") or 0), 0)
+        except ValueError:
+            request_size = 0
+        return request_size, self._get_response_size(response)
+
+    def _get_response_size(self, response):
+        """Get the response size without consuming streamed content.
+
+        Uses the Content-Length header when set, otherwise the length of the
+        already materialized content. Streaming responses without the header
+        are reported as 0 since their size is unknown until sent.
+
+        Args:
+            response (HttpResponse): The HTTP response.
+
+        Returns:
+            int: Response body size.
+        """
+        content_length = response.get("Content-Length")
+        if content_length:
+            return int(content_length)
+        if response.streaming:
+            return 0
+        return len(response.content)
 
     def _get_error_content(self, response):
         """Extract error content from response if status >= 400.
 
+        Only the first MAX_ERROR_SIZE bytes are kept, and streaming responses
+        are skipped so their content is not consumed.
+
         Args:
             response (HttpResponse): The HTTP response.
 
         Returns:
             str: Error content or empty string.
         """
-        if response.status_code >= 400:
-            try:
-                return response.content.decode("utf-8")
-            except (AttributeError, UnicodeDecodeError):
-                return str(response.content)
-        return ""
+        if response.status_code < 400 or response.streaming:
+            return ""
+        return response.content[:MAX_ERROR_SIZE].decode(
+            "utf-8", errors="replace"
+        )
 
     def _get_user_info(self, request):
         """Get user and username from request.
 
+        The user is fetched once and only is_authenticated is checked, so the
+        lazy user set by the authentication middleware is resolved at most once.
+
         Args:
             request (HttpRequest): The HTTP request.
 
         Returns:
             tuple: (user, username)
         """
-        if (
-            hasattr(request, "user")
-            and request.user
-            and request.user.is_authenticated
-        ):
-            return request.user, request.user.username
-        return None, ""
+        user = getattr(request, "user", None)
+        if user is None or not user.is_authenticated:
+            return None, ""
+        return user, user.username
@@ -0,0 +1,42 @@
+# Generated by Django 6.0 on 2026-10-15 08:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("numenor_monitor", "0003_alter_request_remote_addr"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="request",
+            index=models.Index(
+                fields=["-created_at"], name="numenor_request_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="request",
+            index=models.Index(
+                fields=["status_code", "-created_at"],
+                name="numenor_request_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="request",
+            index=models.Index(
+                fields=["host", "-created_at"], name="numenor_request_host_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="request",
+            index=models.Index(
+                condition=models.Q(("status_code__gte", 400)),
+                fields=["-created_at"],
+                name="numenor_request_errors_idx",
+            ),
+        ),
+    ]
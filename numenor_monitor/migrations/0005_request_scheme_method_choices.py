@@ -0,0 +1,122 @@
+from django.db import migrations, models
+
+SCHEMES = {"http": 1, "https": 2}
+
+METHODS = {
+    "GET": 1,
+    "POST": 2,
+    "PUT": 3,
+    "PATCH": 4,
+    "DELETE": 5,
+    "HEAD": 6,
+    "OPTIONS": 7,
+    "TRACE": 8,
+    "CONNECT": 9,
+}
+
+OTHER_METHOD = 0
+
+
+def encode_scheme_and_method(apps, schema_editor):
+    """Copy scheme and method strings into their integer columns.
+
+    Unknown schemes are stored as http and unknown methods as OTHER.
+    """
+    Request = apps.get_model("numenor_monitor", "Request")
+    requests = Request.objects.using(schema_editor.connection.alias)
+    requests.update(scheme_code=SCHEMES["http"])
+    for label, value in SCHEMES.items():
+        requests.filter(scheme=label).update(scheme_code=value)
+    requests.filter(method__isnull=False).update(method_code=OTHER_METHOD)
+    for label, value in METHODS.items():
+        requests.filter(method=label).update(method_code=value)
+
+
+def decode_scheme_and_method(apps, schema_editor):
+    """Copy the integer scheme and method columns back into strings."""
+    Request = apps.get_model("numenor_monitor", "Request")
+    requests = Request.objects.using(schema_editor.connection.alias)
+    for label, value in SCHEMES.items():
+        requests.filter(scheme_code=value).update(scheme=label)
+    requests.filter(method_code=OTHER_METHOD).update(method="OTHER")
+    for label, value in METHODS.items():
+        requests.filter(method_code=value).update(method=label)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("numenor_monitor", "0004_request_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="request",
+            name="scheme_code",
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name="request",
+            name="method_code",
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AlterField(
+            model_name="request",
+            name="scheme",
+            field=models.CharField(
+                help_text="The protocol scheme of the URL, such as 'http' or 'https'.",
+                max_length=10,
+                null=True,
+            ),
+        ),
+        migrations.RunPython(
+            encode_scheme_and_method, decode_scheme_and_method
+        ),
+        migrations.RemoveField(
+            model_name="request",
+            name="scheme",
+        ),
+        migrations.RemoveField(
+            model_name="request",
+            name="method",
+        ),
+        migrations.RenameField(
+            model_name="request",
+            old_name="scheme_code",
+            new_name="scheme",
+        ),
+        migrations.RenameField(
+            model_name="request",
+            old_name="method_code",
+            new_name="method",
+        ),
+        migrations.AlterField(
+            model_name="request",
+            name="scheme",
+            field=models.PositiveSmallIntegerField(
+                choices=[(1, "http"), (2, "https")],
+                help_text="The protocol scheme of the URL, such as 'http' or 'https'.",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="request",
+            name="method",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                choices=[
+                    (0, "OTHER"),
+                    (1, "GET"),
+                    (2, "POST"),
+                    (3, "PUT"),
+                    (4, "PATCH"),
+                    (5, "DELETE"),
+                    (6, "HEAD"),
+                    (7, "OPTIONS"),
+                    (8, "TRACE"),
+                    (9, "CONNECT"),
+                ],
+                help_text="The HTTP method used in the request, e.g., 'GET', 'POST', 'PUT', 'DELETE'.",
+                null=True,
+            ),
+        ),
+    ]
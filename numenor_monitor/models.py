@@ -7,12 +7,15 @@ class Request(models.Model):
     This model captures details of each HTTP request, including the URL components and client information.
     It is designed to log and analyze request patterns for monitoring purposes.
 
+    The scheme and method are stored as small integers (see Scheme and Method) to keep
+    rows and their indexes narrow; their labels are the original strings.
+
     Attributes:
-        scheme (str): The scheme of the URL (e.g., 'http' or 'https').
+        scheme (int): The scheme of the URL (Scheme.HTTP or Scheme.HTTPS).
         host (str): The host part of the URL (e.g., 'example.com').
         path (str): The path part of the URL (e.g., '/path/to/resource').
         query (str): The query string of the URL (e.g., 'param1=value1&param2=value2').
-        method (str): The HTTP method used in the request (e.g., 'GET', 'POST', 'PUT', 'DELETE').
+        method (int): The HTTP method used in the request (e.g., Method.GET, Method.POST).
         remote_addr (str): The REMOTE_ADDR of the request — the direct TCP connection IP.
         x_forwarded_for (str): Raw X-Forwarded-For header value, if present.
         cf_connecting_ip (str): CF-Connecting-IP header set by Cloudflare, if present.
@@ -28,8 +31,28 @@ class Request(models.Model):
         created_at (datetime): The timestamp when the record was created.
     """
 
-    scheme = models.CharField(
-        max_length=10,
+    class Scheme(models.IntegerChoices):
+        """URL schemes a request can be served over."""
+
+        HTTP = 1, "http"
+        HTTPS = 2, "https"
+
+    class Method(models.IntegerChoices):
+        """HTTP methods; OTHER covers extension methods such as PROPFIND."""
+
+        OTHER = 0, "OTHER"
+        GET = 1, "GET"
+        POST = 2, "POST"
+        PUT = 3, "PUT"
+        PATCH = 4, "PATCH"
+        DELETE = 5, "DELETE"
+        HEAD = 6, "HEAD"
+        OPTIONS = 7, "OPTIONS"
+        TRACE = 8, "TRACE"
+        CONNECT = 9, "CONNECT"
+
+    scheme = models.PositiveSmallIntegerField(
+        choices=Scheme.choices,
         help_text="The protocol scheme of the URL, such as 'http' or 'https'.",
     )
     host = models.CharField(
@@ -44,8 +67,8 @@ class Request(models.Model):
         blank=True,
         help_text="The query string of the URL, e.g., 'key1=value1&key2=value2'. Leave blank if none.",
     )
-    method = models.CharField(
-        max_length=10,
+    method = models.PositiveSmallIntegerField(
+        choices=Method.choices,
         null=True,
         blank=True,
         help_text="The HTTP method used in the request, e.g., 'GET', 'POST', 'PUT', 'DELETE'.",
@@ -109,16 +132,36 @@ class Request(models.Model):
         """Meta options for the Request model.
 
         Provides ordering and verbose names for better admin interface and queries.
+        Indexes back the default ordering, the admin status and host filters, and error
+        triage on responses with status >= 400.
         """
 
         ordering = ["-created_at"]
         verbose_name = "Request"
         verbose_name_plural = "Requests"
+        indexes = [
+            models.Index(
+                fields=["-created_at"], name="numenor_request_created_idx"
+            ),
+            models.Index(
+                fields=["status_code", "-created_at"],
+                name="numenor_request_status_idx",
+            ),
+            models.Index(
+                fields=["host", "-created_at"], name="numenor_request_host_idx"
+            ),
+            models.Index(
+                fields=["-created_at"],
+                name="numenor_request_errors_idx",
+                condition=models.Q(status_code__gte=400),
+            ),
+        ]
 
     def __str__(self):
         """String representation of the Request instance.
 
         Returns a formatted string showing the full URL.
         """
+        scheme = self.get_scheme_display()
         query_part = f"?{self.query}" if self.query else ""
-        return f"{self.scheme}://{self.host}{self.path}{query_part}"
+        return f"{scheme}://{self.host}{self.path}{query_part}"
@@ -1,10 +1,24 @@
-from unittest.mock import patch
+import datetime
+import signal
+import time
+from io import StringIO
+from unittest.mock import Mock, patch
 
-from django.contrib.auth.models import User
+from django.contrib.admin.sites import AdminSite
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.management import CommandError, call_command
+from django.http import HttpResponse, StreamingHttpResponse
 from django.test import RequestFactory, TestCase
 from django.utils import timezone
 
-from numenor_monitor.middlewares import RequestLogger, RequestLoggingMiddleware
+from numenor_monitor.admin import RequestAdmin
+from numenor_monitor.middlewares import (
+    LOGGED_FIELDS,
+    MAX_BULK_CREATE_BATCH_SIZE,
+    MAX_ERROR_SIZE,
+    RequestLogger,
+    RequestLoggingMiddleware,
+)
 from numenor_monitor.models import Request
 
 
@@ -17,11 +31,11 @@ class RequestModelTest(TestCase):
         start_time = timezone.now()
         end_time = timezone.now()
         record = Request.objects.create(
-            scheme="https",
+            scheme=Request.Scheme.HTTPS,
             host="example.com",
             path="/test",
             query="param=value",
-            method="GET",
+            method=Request.Method.GET,
             remote_addr="192.168.1.1",
             x_forwarded_for="10.0.0.1, 192.168.1.1",
             cf_connecting_ip="10.0.0.1",
@@ -35,11 +49,11 @@ class RequestModelTest(TestCase):
             request_size=100,
             response_size=500,
         )
-        self.assertEqual(record.scheme, "https")
+        self.assertEqual(record.scheme, Request.Scheme.HTTPS)
         self.assertEqual(record.host, "example.com")
         self.assertEqual(record.path, "/test")
         self.assertEqual(record.query, "param=value")
-        self.assertEqual(record.method, "GET")
+        self.assertEqual(record.method, Request.Method.GET)
         self.assertEqual(record.remote_addr, "192.168.1.1")
         self.assertEqual(record.x_forwarded_for, "10.0.0.1, 192.168.1.1")
         self.assertEqual(record.cf_connecting_ip, "10.0.0.1")
@@ -58,7 +72,7 @@ class RequestModelTest(TestCase):
         """Test the string representation of Request."""
         start_time = timezone.now()
         record = Request.objects.create(
-            scheme="http",
+            scheme=Request.Scheme.HTTP,
             host="test.com",
             path="/path",
             query="",
@@ -78,7 +92,7 @@ class RequestModelTest(TestCase):
         """Test the string representation with query string."""
         start_time = timezone.now()
         record = Request.objects.create(
-            scheme="https",
+            scheme=Request.Scheme.HTTPS,
             host="example.com",
             path="/search",
             query="q=test",
@@ -95,6 +109,63 @@ class RequestModelTest(TestCase):
         self.assertEqual(str(record), "https://example.com/search?q=test")
 
 
+class RequestAdminTest(TestCase):
+    """Test cases for the RequestAdmin configuration."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.admin = RequestAdmin(Request, AdminSite())
+        self.record = Request(
+            start_at=datetime.datetime(
+                2026, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.UTC
+            ),
+            end_at=None,
+        )
+
+    def test_format_timestamps_in_python(self):
+        """Test formatting when the query did not format the timestamps."""
+        self.assertEqual(
+            self.admin.format_start_at(self.record),
+            "2026-01-02 03:04:05.678901",
+        )
+        self.assertEqual(self.admin.format_end_at(self.record), "")
+
+    def test_format_timestamps_from_query(self):
+        """Test that timestamps formatted by the database are used as-is."""
+        self.record.formatted_start_at = "2026-01-02 03:04:05.000000"
+        self.assertEqual(
+            self.admin.format_start_at(self.record),
+            "2026-01-02 03:04:05.000000",
+        )
+
+
+def _log(logger, path="/path", remote_addr="127.0.0.1", method="GET", **fields):
+    """Log a request through logger, defaulting every field a test does not check."""
+    start_at = timezone.now()
+    logger.log_request(
+        **{
+            "scheme": "http",
+            "host": "test.com",
+            "path": path,
+            "query": "",
+            "method": method,
+            "remote_addr": remote_addr,
+            "x_forwarded_for": None,
+            "cf_connecting_ip": None,
+            "user_agent": "",
+            "user": None,
+            "username": "",
+            "start_at": start_at,
+            "end_at": start_at,
+            "status_code": 200,
+            "error": "",
+            "request_size": 0,
+            "response_size": 100,
+            **fields,
+        }
+    )
+
+
 class RequestLoggerTest(TestCase):
     """Test cases for the RequestLogger class."""
 
@@ -107,7 +178,7 @@ class RequestLoggerTest(TestCase):
         pass
 
     def test_log_request_queues_data(self):
-        """Test that log_request adds data to the queue."""
+        """Test that log_request adds data to the buffer."""
         start_time = timezone.now()
         end_time = timezone.now()
         self.logger.log_request(
@@ -129,7 +200,7 @@ class RequestLoggerTest(TestCase):
             0,
             100,
         )
-        self.assertEqual(self.logger.queue.qsize(), 1)
+        self.assertEqual(len(self.logger.buffers[0]), 1)
 
     def test_batch_processing(self):
         """Test that batch processing works and creates records."""
@@ -176,24 +247,47 @@ class RequestLoggerTest(TestCase):
         self.logger.process_batch()
         self.assertEqual(Request.objects.count(), 2)
 
+    def test_batch_processing_with_user(self):
+        """Test that buffered rows keep the user and get created_at on insert."""
+        user = User.objects.create_user(username="testuser")
+        _log(
+            self.logger,
+            scheme="https",
+            query="q=1",
+            user_agent="Agent",
+            user=user,
+            username=user.username,
+            request_size=10,
+        )
+        self.logger.process_batch()
+        record = Request.objects.get()
+        self.assertEqual(record.user, user)
+        self.assertEqual(record.username, "testuser")
+        self.assertEqual(record.query, "q=1")
+        self.assertEqual(record.response_size, 100)
+        self.assertIsNotNone(record.created_at)
+
     def test_flush_batch_success(self):
         """Test that _flush_batch works on success."""
         batch = [
-            Request(
-                scheme="http",
-                host="test.com",
-                path="/",
-                query="",
-                method="GET",
-                remote_addr="127.0.0.1",
-                x_forwarded_for=None,
-                cf_connecting_ip=None,
-                user_agent="",
-                start_at=timezone.now(),
-                status_code=200,
-                error="",
-                request_size=0,
-                response_size=0,
+            (
+                Request.Scheme.HTTP,
+                "test.com",
+                "/",
+                "",
+                Request.Method.GET,
+                "127.0.0.1",
+                None,
+                None,
+                "",
+                None,
+                "",
+                timezone.now(),
+                None,
+                200,
+                "",
+                0,
+                0,
             )
         ]
         initial_count = Request.objects.count()
@@ -206,27 +300,171 @@ class RequestLoggerTest(TestCase):
         """Test that _flush_batch handles exceptions gracefully."""
         mock_bulk_create.side_effect = Exception("DB error")
         batch = [
-            Request(
-                scheme="http",
-                host="test.com",
-                path="/",
-                query="",
-                method="GET",
-                remote_addr="127.0.0.1",
-                x_forwarded_for=None,
-                cf_connecting_ip=None,
-                user_agent="",
-                start_at=timezone.now(),
-                status_code=200,
-                error="",
-                request_size=0,
-                response_size=0,
+            (
+                Request.Scheme.HTTP,
+                "test.com",
+                "/",
+                "",
+                Request.Method.GET,
+                "127.0.0.1",
+                None,
+                None,
+                "",
+                None,
+                "",
+                timezone.now(),
+                None,
+                200,
+                "",
+                0,
+                0,
             )
         ]
         self.logger._flush_batch(batch)
         self.assertEqual(len(batch), 0)
         mock_bulk_create.assert_called_once()
 
+    @patch("numenor_monitor.models.Request.objects.bulk_create")
+    def test_flush_batch_bulk_create_batch_size(self, mock_bulk_create):
+        """Test that _flush_batch bounds the rows per INSERT statement."""
+        logger = RequestLogger(use_thread=False, bulk_create_batch_size=7)
+        logger._flush_batch([])
+        mock_bulk_create.assert_called_once_with([], batch_size=7)
+
+    def test_bulk_create_batch_size_capped(self):
+        """Test that the INSERT chunk size stays under the bind-parameter limit."""
+        logger = RequestLogger(use_thread=False, bulk_create_batch_size=10**6)
+        self.assertEqual(
+            logger.bulk_create_batch_size, MAX_BULK_CREATE_BATCH_SIZE
+        )
+
+    @patch("numenor_monitor.middlewares._supports_copy", return_value=True)
+    @patch("numenor_monitor.middlewares.connections")
+    def test_bulk_create_uses_copy(self, mock_connections, mock_supports_copy):
+        """Test that rows are streamed with COPY when the backend supports it."""
+        mock_connection = mock_connections.__getitem__.return_value
+        mock_connection.ops.quote_name = lambda name: f'"{name}"'
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        copy = cursor.copy.return_value.__enter__.return_value
+        _log(self.logger)
+        self.logger.process_batch()
+        sql = cursor.copy.call_args[0][0]
+        self.assertTrue(sql.startswith('COPY "numenor_monitor_request" ('))
+        self.assertTrue(sql.endswith('"created_at") FROM STDIN'))
+        row = copy.write_row.call_args[0][0]
+        self.assertEqual(row[:3], (Request.Scheme.HTTP, "test.com", "/path"))
+        self.assertEqual(len(row), len(LOGGED_FIELDS) + 1)
+        self.assertEqual(Request.objects.count(), 0)
+
+    @patch("numenor_monitor.middlewares.transaction.atomic")
+    @patch("numenor_monitor.models.Request.objects.db_manager")
+    def test_bulk_create_uses_database_alias(
+        self, mock_db_manager, mock_atomic
+    ):
+        """Test that batches are written and committed on the logger's alias."""
+        logger = RequestLogger(use_thread=False, using="logging")
+        with patch(
+            "numenor_monitor.middlewares.connections"
+        ) as mock_connections:
+            mock_connections.__getitem__.return_value.vendor = "sqlite"
+            logger._bulk_create([])
+        mock_connections.__getitem__.assert_called_with("logging")
+        mock_atomic.assert_called_once_with(using="logging")
+        mock_db_manager.assert_called_once_with("logging")
+
+    def test_logged_fields_match_model(self):
+        """Test that LOGGED_FIELDS lists every concrete field except the primary key and
+        created_at, in model order."""
+        self.assertEqual(
+            LOGGED_FIELDS,
+            tuple(
+                field.attname
+                for field in Request._meta.concrete_fields
+                if not field.primary_key and field.name != "created_at"
+            ),
+        )
+
+    def test_logged_row_matches_logged_fields(self):
+        """Test that a buffered row has one value per LOGGED_FIELDS entry."""
+        _log(self.logger)
+        self.assertEqual(len(self.logger.buffers[0][0]), len(LOGGED_FIELDS))
+
+    def test_drain_buffer_stops_at_batch_size(self):
+        """Test that _drain_buffer takes buffered items up to batch_size."""
+        for path in ("/path1", "/path2", "/path3"):
+            _log(self.logger, path=path)
+        batch = []
+        self.logger._drain_buffer(self.logger.buffers[0], batch)
+        self.assertEqual([r[2] for r in batch], ["/path1", "/path2"])
+        self.assertEqual(len(self.logger.buffers[0]), 1)
+
+    def test_log_request_encodes_scheme_and_method(self):
+        """Test that scheme and method are buffered as their integer values."""
+        _log(self.logger, scheme="https", method="PROPFIND")
+        row = self.logger.buffers[0][0]
+        self.assertEqual(row[0], Request.Scheme.HTTPS)
+        self.assertEqual(row[4], Request.Method.OTHER)
+
+    def test_buffer_drops_oldest_when_full(self):
+        """Test that a full buffer drops the oldest entries."""
+        logger = RequestLogger(use_thread=False, max_buffer=1)
+        for path in ("/old", "/new"):
+            _log(logger, path=path)
+        self.assertEqual(len(logger.buffers[0]), 1)
+        self.assertEqual(logger.buffers[0][0][2], "/new")
+
+    def test_stop_flushes_pending_records(self):
+        """Test that stop inserts the records still in the buffer."""
+        _log(self.logger)
+        self.logger.stop()
+        self.assertEqual(len(self.logger.buffers[0]), 0)
+        self.assertEqual(Request.objects.count(), 1)
+
+    def test_flush_due_after_flush_interval(self):
+        """Test that a partial batch is due once its deadline has passed."""
+        _log(self.logger)
+        batch = []
+        self.logger._drain_buffer(self.logger.buffers[0], batch)
+        self.assertEqual(len(batch), 1)
+        now = time.monotonic()
+        self.assertFalse(
+            self.logger._flush_due(batch, now + self.logger.flush_interval)
+        )
+        self.assertTrue(self.logger._flush_due(batch, now))
+
+    def test_log_request_spreads_across_workers(self):
+        """Test that records from one address are spread over every worker."""
+        logger = RequestLogger(use_thread=False, workers=4)
+        for _ in range(8):
+            _log(logger, remote_addr="10.0.0.1")
+        self.assertEqual([len(buffer) for buffer in logger.buffers], [2] * 4)
+        logger.process_batch()
+        self.assertEqual(Request.objects.count(), 8)
+
+    def test_sigterm_stops_and_chains_previous_handler(self):
+        """Test that SIGTERM only signals the workers to stop before the old handler,
+        leaving the flush to them and the exit hook."""
+        previous = Mock()
+        original = signal.signal(signal.SIGTERM, previous)
+        self.addCleanup(signal.signal, signal.SIGTERM, original)
+        self.logger.install_signal_handlers()
+        _log(self.logger)
+        signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+        self.assertTrue(self.logger._stop_event.is_set())
+        self.assertEqual(Request.objects.count(), 0)
+        previous.assert_called_once_with(signal.SIGTERM, None)
+
+    def test_sigterm_default_disposition_exits(self):
+        """Test that SIGTERM with the default disposition exits through SystemExit so
+        the exit hook flushes pending records."""
+        original = signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        self.addCleanup(signal.signal, signal.SIGTERM, original)
+        self.logger.install_signal_handlers()
+        with self.assertRaises(SystemExit) as cm:
+            signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+        self.assertEqual(cm.exception.code, 128 + signal.SIGTERM)
+        self.assertTrue(self.logger._stop_event.is_set())
+
     def test_batch_size_flush(self):
         """Test that process_batch flushes when batch size is reached."""
         self.logger.batch_size = 1
@@ -260,8 +498,15 @@ class RequestLoggingMiddlewareTest(TestCase):
     def setUp(self):
         """Set up test fixtures."""
         self.factory = RequestFactory()
+        patcher = patch("numenor_monitor.middlewares._start_request_logger")
+        self.mock_start = patcher.start()
+        self.addCleanup(patcher.stop)
         self.middleware = RequestLoggingMiddleware(lambda r: None)
 
+    def test_init_starts_request_logger(self):
+        """Test that loading the middleware starts the request logger."""
+        self.mock_start.assert_called_once_with()
+
     def test_middleware_call(self):
         """Test the __call__ method of the middleware."""
         request = self.factory.get("/test/")
@@ -349,3 +594,177 @@ class RequestLoggingMiddlewareTest(TestCase):
         self.assertEqual(call_args["remote_addr"], "192.168.1.100")
         self.assertIsNone(call_args["x_forwarded_for"])
         self.assertIsNone(call_args.get("cf_connecting_ip"))
+
+    @patch("numenor_monitor.middlewares.request_logger.log_request")
+    def test_streaming_response_not_consumed(self, mock_log):
+        """Test that streaming responses are logged without reading them."""
+        request = self.factory.get("/")
+        self.middleware.get_response = lambda r: StreamingHttpResponse(
+            iter([b"Error"]), status=500
+        )
+        response = self.middleware(request)
+        call_args = mock_log.call_args[1]
+        self.assertEqual(call_args["response_size"], 0)
+        self.assertEqual(call_args["error"], "")
+        self.assertEqual(b"".join(response.streaming_content), b"Error")
+
+    @patch("numenor_monitor.middlewares.request_logger.log_request")
+    def test_response_size_from_content_length(self, mock_log):
+        """Test that the Content-Length header is used as response size."""
+        request = self.factory.get("/")
+        response = HttpResponse(b"abc")
+        response["Content-Length"] = "3"
+        self.middleware.get_response = lambda r: response
+        self.middleware(request)
+        self.assertEqual(mock_log.call_args[1]["response_size"], 3)
+
+    @patch("numenor_monitor.middlewares.request_logger.log_request")
+    def test_error_content_truncated(self, mock_log):
+        """Test that error content is capped at MAX_ERROR_SIZE bytes."""
+        request = self.factory.get("/")
+        self.middleware.get_response = lambda r: HttpResponse(
+            b"x" * (MAX_ERROR_SIZE + 1), status=500
+        )
+        self.middleware(request)
+        call_args = mock_log.call_args[1]
+        self.assertEqual(call_args["error"], "x" * MAX_ERROR_SIZE)
+        self.assertEqual(call_args["response_size"], MAX_ERROR_SIZE + 1)
+
+    @patch("numenor_monitor.middlewares.request_logger.log_request")
+    def test_request_size_without_content_length(self, mock_log):
+        """Test that the request body is not read when CONTENT_LENGTH is missing."""
+        request = self.factory.post("/", data=b"abc", content_type="text/plain")
+        del request.META["CONTENT_LENGTH"]
+        self.middleware.get_response = lambda r: HttpResponse(status=200)
+        self.middleware(request)
+        self.assertEqual(mock_log.call_args[1]["request_size"], 0)
+        self.assertFalse(hasattr(request, "_body"))
+
+    @patch("numenor_monitor.middlewares.request_logger.log_request")
+    def test_end_at_not_before_start_at(self, mock_log):
+        """Test that end_at is derived from start_at and the request duration."""
+        request = self.factory.get("/")
+        self.middleware.get_response = lambda r: HttpResponse(status=200)
+        self.middleware(request)
+        call_args = mock_log.call_args[1]
+        self.assertGreaterEqual(call_args["end_at"], call_args["start_at"])
+
+    @patch("numenor_monitor.middlewares.request_logger.log_request")
+    def test_malformed_content_length_logged_as_zero(self, mock_log):
+        """Test that a malformed Content-Length is logged with size 0."""
+        request = self.factory.post("/", b"x", content_type="text/plain")
+        request.META["CONTENT_LENGTH"] = "abc"
+        self.middleware.get_response = lambda r: HttpResponse(status=400)
+        self.middleware(request)
+        self.assertEqual(mock_log.call_args[1]["request_size"], 0)
+        self.assertEqual(mock_log.call_args[1]["status_code"], 400)
+
+    @patch("numenor_monitor.middlewares.request_logger.log_request")
+    def test_skip_re_paths_not_logged(self, mock_log):
+        """Test that paths matching NUMENOR_SKIP_RE bypass logging."""
+        request = self.factory.get("/static/app.css")
+        self.middleware.get_response = lambda r: HttpResponse(status=200)
+        response = self.middleware(request)
+        self.assertEqual(response.status_code, 200)
+        mock_log.assert_not_called()
+
+    @patch("numenor_monitor.middlewares.request_logger.log_request")
+    def test_skip_re_near_misses_logged(self, mock_log):
+        """Test that application paths sharing a prefix with a skipped path are still
+        logged."""
+        self.middleware.get_response = lambda r: HttpResponse(status=200)
+        skipped = ("/static/app.css", "/media/a.png", "/favicon.ico", "/health/")
+        logged = ("/healthcare/", "/media-kit/", "/mediator/api", "/favicons/")
+        for path in skipped + logged:
+            self.middleware(self.factory.get(path))
+        self.assertEqual(
+            [call[1]["path"] for call in mock_log.call_args_list], list(logged)
+        )
+
+    @patch("numenor_monitor.middlewares.request_logger.log_request")
+    def test_skip_re_disabled(self, mock_log):
+        """Test that an empty NUMENOR_SKIP_RE logs every path."""
+        with self.settings(NUMENOR_SKIP_RE=None):
+            middleware = RequestLoggingMiddleware(
+                lambda r: HttpResponse(status=200)
+            )
+        middleware(self.factory.get("/static/app.css"))
+        mock_log.assert_called_once()
+
+    def test_get_user_info(self):
+        """Test user extraction for missing, anonymous and authenticated users."""
+        user = User.objects.create_user(username="testuser")
+        request = self.factory.get("/")
+        self.assertEqual(self.middleware._get_user_info(request), (None, ""))
+        request.user = AnonymousUser()
+        self.assertEqual(self.middleware._get_user_info(request), (None, ""))
+        request.user = user
+        self.assertEqual(
+            self.middleware._get_user_info(request), (user, "testuser")
+        )
+
+    @patch("numenor_monitor.middlewares.random.random", return_value=0.5)
+    @patch("numenor_monitor.middlewares.request_logger.log_request")
+    def test_sample_ok_drops_unsampled_success(self, mock_log, mock_random):
+        """Test that NUMENOR_SAMPLE_OK drops unsampled successful responses."""
+        with self.settings(NUMENOR_SAMPLE_OK=0.5):
+            middleware = RequestLoggingMiddleware(
+                lambda r: HttpResponse(status=200)
+            )
+        response = middleware(self.factory.get("/"))
+        self.assertEqual(response.status_code, 200)
+        mock_log.assert_not_called()
+        mock_random.return_value = 0.25
+        middleware(self.factory.get("/"))
+        mock_log.assert_called_once()
+
+    @patch("numenor_monitor.middlewares.random.random", return_value=0.5)
+    @patch("numenor_monitor.middlewares.request_logger.log_request")
+    def test_sample_ok_always_logs_errors(self, mock_log, mock_random):
+        """Test that responses with status >= 400 are logged regardless of
+        NUMENOR_SAMPLE_OK."""
+        with self.settings(NUMENOR_SAMPLE_OK=0):
+            middleware = RequestLoggingMiddleware(
+                lambda r: HttpResponse(status=404)
+            )
+        middleware(self.factory.get("/"))
+        mock_log.assert_called_once()
+        mock_random.assert_not_called()
+
+
+class TrimRequestLogCommandTest(TestCase):
+    """Test cases for the trim_request_log management command."""
+
+    def create_request(self, path, days_ago):
+        """Create a Request logged the given number of days ago."""
+        record = Request.objects.create(
+            scheme=Request.Scheme.HTTP,
+            host="test.com",
+            path=path,
+            remote_addr="127.0.0.1",
+            start_at=timezone.now(),
+            status_code=200,
+        )
+        Request.objects.filter(pk=record.pk).update(
+            created_at=timezone.now() - datetime.timedelta(days=days_ago)
+        )
+
+    def test_trim_request_log(self):
+        """Test that only requests older than the retention are deleted."""
+        self.create_request("/old1", 40)
+        self.create_request("/old2", 31)
+        self.create_request("/new", 1)
+        out = StringIO()
+        call_command("trim_request_log", days=30, batch_size=1, stdout=out)
+        self.assertEqual(
+            list(Request.objects.values_list("path", flat=True)), ["/new"]
+        )
+        self.assertIn("Deleted 2 requests", out.getvalue())
+
+    def test_trim_request_log_rejects_non_positive_options(self):
+        """Test that --days and --batch-size below 1 raise CommandError."""
+        self.create_request("/old", 40)
+        for options in ({"days": 0}, {"days": -1}, {"batch_size": 0}):
+            with self.subTest(**options), self.assertRaises(CommandError):
+                call_command("trim_request_log", **options)
+        self.assertEqual(Request.objects.count(), 1)
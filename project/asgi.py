@@ -1,6 +1,8 @@
 """ASGI config for project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The URL resolver is populated at import so the first request served by each
+worker does not pay for compiling the URL patterns.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
@@ -9,7 +11,10 @@ https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 import os
 
 from django.core.asgi import get_asgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
 
 application = get_asgi_application()
+
+get_resolver()._populate()
@@ -0,0 +1,20 @@
+import orjson
+from django.http import HttpResponse
+
+
+def json_response(obj, status=200):
+    """Build a JSON HttpResponse from the bytes serialized by orjson.
+
+    No orjson options are passed: the default output is already compact, with
+    no whitespace after separators and no indentation, even with DEBUG on.
+
+    Args:
+        obj: JSON-serializable object.
+        status (int): HTTP status code.
+
+    Returns:
+        HttpResponse: The response with an application/json content type.
+    """
+    return HttpResponse(
+        orjson.dumps(obj), status=status, content_type="application/json"
+    )
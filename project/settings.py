@@ -9,6 +9,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -118,3 +119,38 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/6.0/howto/static-files/
 
 STATIC_URL = "static/"
+
+
+# Request bodies
+# https://docs.djangoproject.com/en/6.0/ref/settings/#data-upload-max-memory-size
+
+DATA_UPLOAD_MAX_MEMORY_SIZE = 1024 * 1024
+
+
+# Numenor Monitor
+
+# Number of logged requests accumulated before flushing them to the database.
+NUMENOR_LOG_BATCH = 1000
+
+# Seconds a partial batch may wait before being flushed.
+NUMENOR_LOG_FLUSH_INTERVAL = 5
+
+# Maximum number of rows per INSERT statement emitted by the request logger.
+NUMENOR_BULK_CREATE_BATCH_SIZE = int(
+    os.environ.get("NUMENOR_BULK_CREATE_BATCH_SIZE", 500)
+)
+
+# Requests whose path matches this regex are not logged; None logs everything.
+NUMENOR_SKIP_RE = r"^/(static|media)/|^/favicon\.ico$|^/health/?$"
+
+# Database alias the request logger writes to.
+NUMENOR_DATABASE = "default"
+
+# Background threads inserting logged requests, each with its own connection.
+NUMENOR_FLUSH_WORKERS = 1
+
+# Days of requests kept by the trim_request_log management command.
+NUMENOR_RETENTION_DAYS = 30
+
+# Fraction of responses with status < 400 that are logged; errors always are.
+NUMENOR_SAMPLE_OK = 1.0
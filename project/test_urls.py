@@ -0,0 +1,13 @@
+from django.urls import path
+
+from . import test_views
+
+urlpatterns = [
+    path("simple/", test_views.simple_get, name="simple_get"),
+    path("query/", test_views.get_with_query, name="get_with_query"),
+    path("post/", test_views.post_with_data, name="post_with_data"),
+    path("404/", test_views.cause_404, name="cause_404"),
+    path("500/", test_views.cause_500, name="cause_500"),
+    path("large-response/", test_views.large_response, name="large_response"),
+    path("large-request/", test_views.large_request, name="large_request"),
+]
@@ -1,41 +1,137 @@
-import json
+import functools
+import re
 
-from django.http import Http404, JsonResponse
-from django.views.decorators.csrf import csrf_exempt
+import orjson
+from django.http import (
+    HttpResponse,
+    HttpResponseNotFound,
+    StreamingHttpResponse,
+)
+from django.views.decorators.http import require_POST
+
+from .responses import json_response
+
+SIMPLE_GET_BODY = orjson.dumps(
+    {"message": "Simple GET request", "status": "success"}
+)
+INVALID_JSON_BODY = orjson.dumps({"message": "Invalid JSON", "status": "error"})
+LARGE_RESPONSE_SIZE = 10000
+X_CHUNK = b"x" * 8192
+READ_CHUNK_SIZE = 65536
+RECEIVED_BODY = orjson.dumps(
+    {"message": "Received %d bytes", "status": "success"}
+)
+MAX_JSON_BYTES = 1024 * 1024
+PAYLOAD_TOO_LARGE_BODY = orjson.dumps(
+    {"message": "Payload too large", "status": "error"}
+)
+INVALID_CONTENT_LENGTH_BODY = orjson.dumps(
+    {"message": "Invalid Content-Length", "status": "error"}
+)
+NOT_FOUND_BODY = orjson.dumps({"message": "Page not found", "status": "error"})
+QUERY_BODY_PREFIX = b'{"message":"Query: '
+QUERY_BODY_SUFFIX = b'","status":"success"}'
+JSON_CONTAINER_RE = re.compile(rb"[ \t\r\n]*[{\[]")
+_MISSING = object()
+
+
+def get_json(request):
+    """Return the request body parsed as JSON.
+
+    The result is cached on the request, so middleware and views reading the
+    same JSON body parse it only once.
+
+    Args:
+        request (HttpRequest): The HTTP request.
+
+    Returns:
+        The parsed JSON value.
+
+    Raises:
+        orjson.JSONDecodeError: If the body is not valid JSON.
+    """
+    data = getattr(request, "_parsed_json", _MISSING)
+    if data is _MISSING:
+        data = request._parsed_json = orjson.loads(request.body)
+    return data
+
+
+def get_content_length(request):
+    """Return the declared body size of the request.
+
+    Args:
+        request (HttpRequest): The HTTP request.
+
+    Returns:
+        int: The CONTENT_LENGTH value, 0 if it is missing, or None if it is
+        not an integer.
+    """
+    try:
+        return int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        return None
 
 
 def simple_get(request):
-    """Simple GET view returning JSON."""
-    return JsonResponse({"message": "Simple GET request", "status": "success"})
+    """Simple GET view returning a precomputed JSON body."""
+    return HttpResponse(SIMPLE_GET_BODY, content_type="application/json")
 
 
 def get_with_query(request):
-    """GET view that processes query parameters."""
+    """GET view that processes query parameters.
+
+    The parameter is escaped by serializing it alone with orjson and dropping the
+    quotes, then spliced between the precomputed halves of the body.
+    """
     q = request.GET.get("q", "default")
-    return JsonResponse({"message": f"Query: {q}", "status": "success"})
+    return HttpResponse(
+        QUERY_BODY_PREFIX + orjson.dumps(q)[1:-1] + QUERY_BODY_SUFFIX,
+        content_type="application/json",
+    )
 
 
-@csrf_exempt
+@require_POST
 def post_with_data(request):
-    """POST view that processes JSON data."""
-    if request.method == "POST":
-        try:
-            data = json.loads(request.body)
-            return JsonResponse(
-                {"message": "Data received", "data": data, "status": "success"}
-            )
-        except json.JSONDecodeError:
-            return JsonResponse(
-                {"message": "Invalid JSON", "status": "error"}, status=400
-            )
-    return JsonResponse(
-        {"message": "Method not allowed", "status": "error"}, status=405
-    )
+    """POST view that processes JSON data.
+
+    Bodies declared larger than MAX_JSON_BYTES are rejected with 413, and a malformed
+    Content-Length with 400, before the body is read or parsed. Bodies that do not start
+    with an object or array are rejected with 400 without calling the parser.
+    """
+    content_length = get_content_length(request)
+    if content_length is None:
+        return HttpResponse(
+            INVALID_CONTENT_LENGTH_BODY,
+            status=400,
+            content_type="application/json",
+        )
+    if content_length > MAX_JSON_BYTES:
+        return HttpResponse(
+            PAYLOAD_TOO_LARGE_BODY,
+            status=413,
+            content_type="application/json",
+        )
+    if not JSON_CONTAINER_RE.match(request.body):
+        return HttpResponse(
+            INVALID_JSON_BODY, status=400, content_type="application/json"
+        )
+    try:
+        data = get_json(request)
+        return json_response(
+            {"message": "Data received", "data": data, "status": "success"}
+        )
+    except orjson.JSONDecodeError:
+        return HttpResponse(
+            INVALID_JSON_BODY, status=400, content_type="application/json"
+        )
+
+
+post_with_data.csrf_exempt = True
 
 
 def cause_404(request):
-    """View that raises 404 error."""
-    raise Http404("Page not found")
+    """View that returns a 404 error without raising Http404."""
+    return HttpResponseNotFound(NOT_FOUND_BODY, content_type="application/json")
 
 
 def cause_500(request):
@@ -44,19 +140,50 @@ def cause_500(request):
 
 
 def large_response(request):
-    """View that returns a large response."""
-    large_data = {"data": "x" * 10000}  # Large content
-    return JsonResponse(large_data)
+    """View that streams a large response.
+
+    The body is yielded in chunks of the preallocated X_CHUNK, so the payload is never
+    held in memory as a whole. Content-Length is set because the size is known up front,
+    which keeps the logged response size accurate.
+    """
+    response = StreamingHttpResponse(
+        _large_response_chunks(LARGE_RESPONSE_SIZE),
+        content_type="application/json",
+    )
+    response["Content-Length"] = LARGE_RESPONSE_SIZE + len(b'{"data":""}')
+    return response
+
+
+def _large_response_chunks(size):
+    """Yield the JSON object {"data": "x" * size} in chunks."""
+    yield b'{"data":"'
+    for _ in range(size // len(X_CHUNK)):
+        yield X_CHUNK
+    yield X_CHUNK[: size % len(X_CHUNK)]
+    yield b'"}'
 
 
-@csrf_exempt
+@require_POST
 def large_request(request):
-    """POST view expecting large request body."""
-    if request.method == "POST":
-        body_size = len(request.body)
-        return JsonResponse(
-            {"message": f"Received {body_size} bytes", "status": "success"}
+    """POST view expecting large request body.
+
+    The size comes from CONTENT_LENGTH; without it the body is read and discarded in
+    READ_CHUNK_SIZE blocks. request.body is never accessed, so the upload is not
+    buffered in memory. A malformed CONTENT_LENGTH is rejected with 400.
+    """
+    body_size = get_content_length(request)
+    if body_size is None:
+        return HttpResponse(
+            INVALID_CONTENT_LENGTH_BODY,
+            status=400,
+            content_type="application/json",
         )
-    return JsonResponse(
-        {"message": "Method not allowed", "status": "error"}, status=405
+    if not body_size:
+        read_chunk = functools.partial(request.read, READ_CHUNK_SIZE)
+        body_size = sum(len(chunk) for chunk in iter(read_chunk, b""))
+    return HttpResponse(
+        RECEIVED_BODY % body_size, content_type="application/json"
     )
+
+
+large_request.csrf_exempt = True
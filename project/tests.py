@@ -0,0 +1,138 @@
+from unittest.mock import patch
+
+import orjson
+from django.test import RequestFactory, SimpleTestCase
+
+from project.test_views import MAX_JSON_BYTES, get_json
+
+
+class ViewTestCase(SimpleTestCase):
+    """Base class for the test view tests.
+
+    The middleware is loaded by the test client, so the request logger start is patched
+    to keep its threads from running.
+    """
+
+    def setUp(self):
+        """Keep the request logger threads from starting."""
+        patcher = patch("numenor_monitor.middlewares._start_request_logger")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class PostWithDataTest(ViewTestCase):
+    """Test cases for the post_with_data test view."""
+
+    def test_object_body(self):
+        """Test that a JSON object is echoed back."""
+        response = self.client.post(
+            "/test/post/", b'{"a": 1}', content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"], {"a": 1})
+
+    def test_scalar_body_rejected(self):
+        """Test that a scalar JSON body is rejected with 400."""
+        response = self.client.post(
+            "/test/post/", b'"str"', content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["message"], "Invalid JSON")
+
+    def test_oversized_body_rejected(self):
+        """Test that a body declared larger than MAX_JSON_BYTES gets 413."""
+        response = self.client.post(
+            "/test/post/",
+            b"{}",
+            content_type="application/json",
+            CONTENT_LENGTH=str(MAX_JSON_BYTES + 1),
+        )
+        self.assertEqual(response.status_code, 413)
+
+    def test_get_not_allowed(self):
+        """Test that GET is answered with 405."""
+        response = self.client.get("/test/post/")
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response["Allow"], "POST")
+
+    def test_malformed_content_length(self):
+        """Test that a malformed Content-Length gets 400 instead of a 500."""
+        response = self.client.post(
+            "/test/post/",
+            b"{}",
+            content_type="application/json",
+            CONTENT_LENGTH="abc",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["message"], "Invalid Content-Length")
+
+
+class LargeRequestTest(ViewTestCase):
+    """Test cases for the large_request test view."""
+
+    def test_body_size(self):
+        """Test that the body size is taken from Content-Length."""
+        response = self.client.post(
+            "/test/large-request/", b"x" * 70000, content_type="text/plain"
+        )
+        self.assertEqual(response.json()["message"], "Received 70000 bytes")
+
+    def test_malformed_content_length(self):
+        """Test that a malformed Content-Length gets 400 instead of a 500."""
+        response = self.client.post(
+            "/test/large-request/",
+            b"x",
+            content_type="text/plain",
+            CONTENT_LENGTH="abc",
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class LargeResponseTest(ViewTestCase):
+    """Test cases for the large_response test view."""
+
+    def test_content_length_matches_body(self):
+        """Test that the declared Content-Length matches the streamed JSON."""
+        response = self.client.get("/test/large-response/")
+        body = b"".join(response.streaming_content)
+        self.assertEqual(len(body), int(response["Content-Length"]))
+        self.assertEqual(orjson.loads(body), {"data": "x" * 10000})
+
+
+class GetWithQueryTest(ViewTestCase):
+    """Test cases for the get_with_query test view."""
+
+    def test_query_is_escaped(self):
+        """Test that quotes, backslashes and non-ASCII text survive the splice."""
+        response = self.client.get("/test/query/", {"q": 'a"b\\cé'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["message"], 'Query: a"b\\cé')
+
+
+class Cause404Test(ViewTestCase):
+    """Test cases for the cause_404 test view."""
+
+    def test_not_found_body(self):
+        """Test that the view answers 404 with the JSON error body."""
+        response = self.client.get("/test/404/")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(
+            response.json(), {"message": "Page not found", "status": "error"}
+        )
+
+
+class GetJsonTest(SimpleTestCase):
+    """Test cases for the get_json helper."""
+
+    def test_parse_is_cached(self):
+        """Test that the body is parsed once and the result reused."""
+        request = RequestFactory().post(
+            "/test/post/", b'{"a": 1}', content_type="application/json"
+        )
+        with patch("orjson.loads", wraps=orjson.loads) as loads:
+            first = get_json(request)
+            second = get_json(request)
+        self.assertEqual(first, {"a": 1})
+        self.assertIs(second, first)
+        loads.assert_called_once()
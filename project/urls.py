@@ -17,19 +17,9 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import include, path
 
-from . import test_views
-
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", include("numenor_monitor.urls")),
     # Test views
-    path("test/simple/", test_views.simple_get, name="simple_get"),
-    path("test/query/", test_views.get_with_query, name="get_with_query"),
-    path("test/post/", test_views.post_with_data, name="post_with_data"),
-    path("test/404/", test_views.cause_404, name="cause_404"),
-    path("test/500/", test_views.cause_500, name="cause_500"),
-    path(
-        "test/large-response/", test_views.large_response, name="large_response"
-    ),
-    path("test/large-request/", test_views.large_request, name="large_request"),
+    path("test/", include("project.test_urls")),
 ]